@@ -1,10 +1,12 @@
 import requests
 import datetime
 import json
+from typing import List
 
 from languagemodels.models import set_max_ram, require_model_license
 from languagemodels.inference import (
     generate_instruct,
+    generate_instruct_batch,
     rank_instruct,
     parse_chat,
     list_tokens,
@@ -62,6 +64,35 @@ def do(prompt: str) -> str:
     """
     result = generate_instruct(prompt, max_tokens=200, topk=1)
 
+    return _format_do_result(result)
+
+
+def do_batch(prompts: List[str]) -> List[str]:
+    """Follow several single-turn instructional prompts
+
+    All prompts are processed together in batches by the local model, which
+    is faster than calling `do` on each prompt in turn. Each result matches
+    what `do` would return for that prompt.
+
+    :param prompts: List of instructional prompts to follow
+    :return: List of completions returned from the language model
+
+    Examples:
+
+    >>> do_batch([
+    ...     "Pick the sport from the list: baseball, texas, chemistry",
+    ...     "Is the following positive or negative: I love Star Trek.",
+    ... ])
+    ['Baseball.', 'Positive.']
+    """
+    results = generate_instruct_batch(prompts, max_tokens=200, topk=1)
+
+    return [_format_do_result(r) for r in results]
+
+
+def _format_do_result(result):
+    """Formats single word responses from `do` as sentences"""
+
     if len(result.split()) == 1:
         result = result.title()
 
@@ -1,4 +1,5 @@
 import numpy as np
+import ctranslate2
 
 from languagemodels.models import get_model
 
@@ -16,13 +17,38 @@ def embed(doc):
     >>> embed("I love Python!")[-3:]
     array([0.1..., 0.1..., 0.0...], dtype=float32)
     """
+    return embed_batch([doc])[0]
+
+
+def embed_batch(docs, max_batch_size=32):
+    """Gets embeddings for a list of documents
+
+    Documents are tokenized in parallel and embedded together in batches of
+    up to `max_batch_size` to bound activation memory.
+
+    >>> embeddings = embed_batch(["I love Python!", "The sky is blue."])
+    >>> len(embeddings)
+    2
+
+    >>> embeddings[0][-3:]
+    array([0.1..., 0.1..., 0.0...], dtype=float32)
+    """
     tokenizer, model = get_model("embedding")
 
-    tokens = tokenizer.encode(doc).ids
-    output = model.forward_batch([tokens[:512]])
-    embedding = np.mean(np.array(output.last_hidden_state), axis=1)[0]
-    embedding = embedding / np.linalg.norm(embedding)
-    return embedding
+    tokens = [e.ids[:512] for e in tokenizer.encode_batch(docs)]
+
+    embeddings = []
+    for start in range(0, len(tokens), max_batch_size):
+        batch = tokens[start : start + max_batch_size]
+        output = model.forward_batch(batch)
+        hidden = np.array(output.last_hidden_state.to_device(ctranslate2.Device.cpu))
+
+        for i, ids in enumerate(batch):
+            # Exclude padding added for shorter inputs in the batch
+            embedding = np.mean(hidden[i, : len(ids)], axis=0)
+            embeddings.append(embedding / np.linalg.norm(embedding))
+
+    return embeddings
 
 
 def search(query, docs):
@@ -62,9 +88,9 @@ class Document:
     against other semantically similar documents.
     """
 
-    def __init__(self, content, name=""):
+    def __init__(self, content, name="", embedding=None):
         self.content = content
-        self.embedding = embed(content)
+        self.embedding = embed(content) if embedding is None else embedding
         self.name = name
 
 
@@ -169,6 +195,8 @@ class RetrievalContext:
         if name:
             name_tokens = get_token_ids(f"From {name} document:")
 
+        texts = []
+
         i = 0
         chunk = name_tokens.copy()
         while i < len(tokens):
@@ -185,8 +213,7 @@ class RetrievalContext:
 
             if eof or full or (half_full and sep):
                 # Store tokens and start next chunk
-                text = generative_tokenizer.decode(chunk)
-                self.chunks.append(Document(text))
+                texts.append(generative_tokenizer.decode(chunk))
                 chunk = name_tokens.copy()
                 if full and not eof:
                     # If the heuristic didn't get a semantic boundary, overlap
@@ -194,6 +221,10 @@ class RetrievalContext:
                     i -= self.chunk_overlap
                     i = max(0, i)
 
+        if texts:
+            for text, embedding in zip(texts, embed_batch(texts)):
+                self.chunks.append(Document(text, embedding=embedding))
+
     def get_context(self, query, max_tokens=128):
         """Gets context matching a query
 
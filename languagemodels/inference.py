@@ -1,6 +1,7 @@
 import requests
 import re
 import os
+from functools import lru_cache
 
 from languagemodels.models import get_model
 
@@ -24,6 +25,16 @@ def list_tokens(prompt):
     return list(zip(tokens, ids))
 
 
+@lru_cache(maxsize=128)
+def _encode_cached(tokenizer, text):
+    """Tokenizes text without special tokens, memoizing the result
+
+    This is used for strings that repeat across calls, such as generation
+    prefixes and suppressed sequences.
+    """
+    return tuple(tokenizer.encode(text, add_special_tokens=False).tokens)
+
+
 def generate_ts(engine, prompt, max_tokens=200):
     """Generates a single text response for a prompt from a textsynth server
 
@@ -120,52 +131,108 @@ def generate_instruct(
 
     This may use a local model, or it may make an API call to an external
     model if API keys are available.
+
+    `max_tokens` limits the number of generated tokens. The prompt does not
+    count toward it.
+    """
+    return generate_instruct_batch(
+        [prompt],
+        max_tokens=max_tokens,
+        temperature=temperature,
+        topk=topk,
+        repetition_penalty=repetition_penalty,
+        prefix=prefix,
+        suppress=suppress,
+    )[0]
+
+
+def generate_instruct_batch(
+    prompts,
+    max_tokens=200,
+    temperature=0.1,
+    topk=1,
+    repetition_penalty=1.2,
+    prefix="",
+    suppress=[],
+    max_batch_size=64,
+):
+    """Generates one completion for each prompt using an instruction-tuned model
+
+    Local models process prompts together in batches of up to
+    `max_batch_size`. The same prefix and suppressed sequences apply to
+    every prompt in the batch.
+
+    `max_tokens` limits the number of generated tokens for each prompt. The
+    prompt does not count toward it, even for decoder-only models.
+
+    This may use a local model, or it may make API calls to an external
+    model if API keys are available.
+
+    >>> results = generate_instruct_batch([
+    ...     "Pick the sport from the list: baseball, texas, chemistry",
+    ...     "Is the following positive or negative: I love Star Trek.",
+    ... ], topk=1)
+    >>> [r.lower().strip(".") for r in results]
+    ['baseball', 'positive']
     """
     if os.environ.get("LANGUAGEMODELS_TS_KEY") or os.environ.get(
         "LANGUAGEMODELS_TS_SERVER"
     ):
-        return generate_ts("flan_t5_xxl_q4", prompt, max_tokens).strip()
+        return [generate_ts("flan_t5_xxl_q4", p, max_tokens).strip() for p in prompts]
 
     if os.environ.get("LANGUAGEMODELS_OA_KEY"):
-        return chat_oa("gpt-3.5-turbo", prompt, max_tokens).strip()
+        return [chat_oa("gpt-3.5-turbo", p, max_tokens).strip() for p in prompts]
 
     tokenizer, model = get_model("instruct")
 
-    suppress = [tokenizer.encode(s, add_special_tokens=False).tokens for s in suppress]
+    suppress = [list(_encode_cached(tokenizer, s)) for s in suppress]
 
     if hasattr(model, "translate_batch"):
+        prefix_tokens = list(_encode_cached(tokenizer, prefix))
         results = model.translate_batch(
-            [tokenizer.encode(prompt).tokens],
-            target_prefix=[tokenizer.encode(prefix, add_special_tokens=False).tokens],
+            [e.tokens for e in tokenizer.encode_batch(prompts)],
+            target_prefix=[prefix_tokens] * len(prompts),
             repetition_penalty=repetition_penalty,
             max_decoding_length=max_tokens,
             sampling_temperature=temperature,
             sampling_topk=topk,
             suppress_sequences=suppress,
             beam_size=1,
+            return_scores=False,
+            return_attention=False,
+            max_batch_size=max_batch_size,
         )
-        output_tokens = results[0].hypotheses[0]
-        output_ids = [tokenizer.token_to_id(t) for t in output_tokens]
-        text = tokenizer.decode(output_ids, skip_special_tokens=True)
+        texts = []
+        for result in results:
+            output_tokens = result.hypotheses[0]
+            output_ids = [tokenizer.token_to_id(t) for t in output_tokens]
+            texts.append(tokenizer.decode(output_ids, skip_special_tokens=True))
     else:
-        prompt = (
+        prompts = [
             "Below is an instruction that describes a task.\n"
             "Write a response that appropriately completes the request.\n\n"
             f"### Instruction:{prompt}\n\n### Response:"
-        )
+            for prompt in prompts
+        ]
+        # The prompt is excluded from results, so max_length counts only
+        # generated tokens, matching max_decoding_length for translators
         results = model.generate_batch(
-            [tokenizer.encode(prompt).tokens],
+            [e.tokens for e in tokenizer.encode_batch(prompts)],
             repetition_penalty=repetition_penalty,
             max_length=max_tokens,
             sampling_temperature=temperature,
             sampling_topk=topk,
             beam_size=1,
+            return_scores=False,
+            include_prompt_in_result=False,
+            max_batch_size=max_batch_size,
         )
-        output_ids = results[0].sequences_ids[0]
-        text = tokenizer.decode(output_ids, skip_special_tokens=True)
-        text = text[len(prompt) :]
+        texts = []
+        for result in results:
+            output_ids = result.sequences_ids[0]
+            texts.append(tokenizer.decode(output_ids, skip_special_tokens=True))
 
-    return text
+    return texts
 
 
 def rank_instruct(input, targets):
@@ -1,145 +1,315 @@
 import os
 import re
+from functools import lru_cache
+from typing import NamedTuple, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from huggingface_hub import hf_hub_download
+from huggingface_hub.utils import LocalEntryNotFoundError
 from tokenizers import Tokenizer
 import ctranslate2
 
 
 modelcache = {}
+# Names of models with weights currently loaded, least recently used first
+loaded_models = []
 max_ram = 512
+_max_ram_cache = None
 license_match = os.environ.get("LANGUAGEMODELS_MODEL_LICENSE")
 
+# Run on a CUDA device when one is available. This can be overridden by
+# setting LANGUAGEMODELS_DEVICE to "cpu" or "cuda".
+# All models are loaded on this device, so on CUDA the max RAM budget
+# applies to GPU memory rather than host memory.
+DEVICE = (os.environ.get("LANGUAGEMODELS_DEVICE") or "").lower()
+if not DEVICE:
+    DEVICE = "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+
+# Compute types to use for int8 weights on each device, in order of preference
+# GPUs use int8 weights with float16 activations. CPUs use native int8
+# kernels when available, falling back to float32 activations.
+COMPUTE_TYPE_PREFERENCES = {
+    "cuda": ["int8_float16", "int8_float32"],
+    "cpu": ["int8", "int8_float32"],
+}
+
+
+def get_compute_type(device):
+    """Returns the preferred compute type supported on a device
+
+    If no preferred compute type is reported as supported, the last
+    preference is returned and ctranslate2 picks the closest available type.
+
+    >>> get_compute_type("cpu") in COMPUTE_TYPE_PREFERENCES["cpu"]
+    True
+    """
+
+    if device not in COMPUTE_TYPE_PREFERENCES:
+        raise ValueError(f"Unsupported LANGUAGEMODELS_DEVICE: {device}")
+
+    supported = ctranslate2.get_supported_compute_types(device)
+
+    for compute_type in COMPUTE_TYPE_PREFERENCES[device]:
+        if compute_type in supported:
+            return compute_type
+
+    return COMPUTE_TYPE_PREFERENCES[device][-1]
+
+
+COMPUTE_TYPE = get_compute_type(DEVICE)
+
+
+def get_physical_cores():
+    """Returns the number of physical CPU cores available to this process
+
+    Only CPUs in this process's affinity mask are counted, and SMT siblings
+    sharing a core are counted once. When CPU topology can't be read, the
+    host's ratio of physical to logical CPUs from psutil is applied if psutil
+    is installed.
+
+    >>> get_physical_cores() >= 1
+    True
+    """
+
+    if hasattr(os, "sched_getaffinity"):
+        cpus = os.sched_getaffinity(0)
+    else:
+        cpus = range(os.cpu_count() or 1)
+
+    cores = set()
+    for cpu in cpus:
+        path = f"/sys/devices/system/cpu/cpu{cpu}/topology/thread_siblings_list"
+        try:
+            with open(path) as f:
+                cores.add(f.read().strip())
+        except OSError:
+            break
+    else:
+        return max(1, len(cores))
+
+    try:
+        import psutil
+
+        physical = psutil.cpu_count(logical=False)
+        logical = psutil.cpu_count()
+        if physical and logical:
+            return max(1, len(cpus) * physical // logical)
+    except ImportError:
+        pass
+
+    return max(1, len(cpus))
+
+
+def get_thread_count(name):
+    """Returns a thread count from an environment variable
+
+    Unset or empty variables return 0, meaning the default is used.
+
+    >>> os.environ["LANGUAGEMODELS_TEST_THREADS"] = ""
+    >>> get_thread_count("LANGUAGEMODELS_TEST_THREADS")
+    0
+
+    >>> os.environ["LANGUAGEMODELS_TEST_THREADS"] = "4"
+    >>> get_thread_count("LANGUAGEMODELS_TEST_THREADS")
+    4
+
+    >>> del os.environ["LANGUAGEMODELS_TEST_THREADS"]
+    """
+
+    value = os.environ.get(name) or "0"
+
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer, not {value!r}") from None
+
+
+# Threads used by ctranslate2 models. These can be overridden via environment
+# variables to match the host's core and NUMA layout. By default, available
+# physical cores are split evenly across inter-op streams.
+INTER_THREADS = max(1, get_thread_count("LANGUAGEMODELS_INTER_THREADS"))
+INTRA_THREADS = get_thread_count("LANGUAGEMODELS_INTRA_THREADS")
+INTRA_THREADS = INTRA_THREADS or max(1, get_physical_cores() // INTER_THREADS)
+
+
+class ModelSpec(NamedTuple):
+    """Metadata describing a model available for use"""
+
+    name: str
+    tuning: str
+    params: float
+    quantization: str
+    architecture: str
+    license: str
+    datasets: Tuple[str, ...] = ()
+
+
 # Model list
-# This list is sorted in priority order, with the best models first
+# Models are sorted in priority order, with the best models first
 # The best model that fits in the memory bounds and matches the model filter
 # will be selected
-models = [
-    {
-        "name": "flan-alpaca-xl-ct2-int8",
-        "tuning": "instruct",
-        "datasets": ["c4", "flan", "alpaca"],
-        "params": 3e9,
-        "quantization": "int8",
-        "architecture": "encoder-decoder-transformer",
-        "license": "cc-by-nc-4.0",  # HF says apache-2.0, but alpaca is NC
-    },
-    {
-        "name": "flan-alpaca-gpt4-xl-ct2-int8",
-        "tuning": "instruct",
-        "datasets": ["c4", "flan", "gpt4-alpaca"],
-        "params": 3e9,
-        "quantization": "int8",
-        "architecture": "encoder-decoder-transformer",
-        "license": "cc-by-nc-4.0",  # HF says apache-2.0, but alpaca is NC
-    },
-    {
-        "name": "flan-t5-xl-ct2-int8",
-        "tuning": "instruct",
-        "datasets": ["c4", "flan"],
-        "params": 3e9,
-        "quantization": "int8",
-        "architecture": "encoder-decoder-transformer",
-        "license": "apache-2.0",
-    },
-    {
-        "name": "fastchat-t5-3b-v1.0-ct2-int8",
-        "tuning": "instruct",
-        "datasets": ["c4", "flan", "sharegpt"],
-        "params": 3e9,
-        "quantization": "int8",
-        "architecture": "encoder-decoder-transformer",
-        "license": "apache-2.0",  # This does use OpenAI-generated data
-    },
-    {
-        "name": "LaMini-Flan-T5-783M-ct2-int8",
-        "tuning": "instruct",
-        "datasets": ["c4", "flan", "lamini"],
-        "params": 783e6,
-        "quantization": "int8",
-        "architecture": "encoder-decoder-transformer",
-        "license": "cc-by-nc-4.0",
-    },
-    {
-        "name": "flan-t5-large-ct2-int8",
-        "tuning": "instruct",
-        "datasets": ["c4", "flan"],
-        "params": 783e6,
-        "quantization": "int8",
-        "architecture": "encoder-decoder-transformer",
-        "license": "apache-2.0",
-    },
-    {
-        "name": "LaMini-Flan-T5-248M-ct2-int8",
-        "tuning": "instruct",
-        "datasets": ["c4", "flan", "lamini"],
-        "params": 248e6,
-        "quantization": "int8",
-        "architecture": "encoder-decoder-transformer",
-        "license": "cc-by-nc-4.0",
-    },
-    {
-        "name": "flan-alpaca-base-ct2-int8",
-        "tuning": "instruct",
-        "datasets": ["c4", "flan", "alpaca"],
-        "params": 248e6,
-        "quantization": "int8",
-        "architecture": "encoder-decoder-transformer",
-        "license": "cc-by-nc-4.0",  # HF says apache-2.0, but alpaca is NC
-    },
-    {
-        "name": "flan-t5-base-ct2-int8",
-        "tuning": "instruct",
-        "datasets": ["c4", "flan"],
-        "params": 248e6,
-        "quantization": "int8",
-        "architecture": "encoder-decoder-transformer",
-        "license": "apache-2.0",
-    },
-    {
-        "name": "LaMini-Flan-T5-77M-ct2-int8",
-        "tuning": "instruct",
-        "datasets": ["c4", "flan", "lamini"],
-        "params": 77e6,
-        "quantization": "int8",
-        "architecture": "encoder-decoder-transformer",
-        "license": "cc-by-nc-4.0",
-    },
-    {
-        "name": "flan-t5-small-ct2-int8",
-        "tuning": "instruct",
-        "datasets": ["c4", "flan"],
-        "params": 77e6,
-        "quantization": "int8",
-        "architecture": "encoder-decoder-transformer",
-        "license": "apache-2.0",
-    },
-    {
-        "name": "LaMini-GPT-774M-ct2-int8",
-        "tuning": "instruct",
-        "datasets": ["webtext", "lamini"],
-        "params": 774e6,
-        "quantization": "int8",
-        "architecture": "decoder-only-transformer",
-        "license": "mit",
-    },
-    {
-        "name": "LaMini-GPT-124M-ct2-int8",
-        "tuning": "instruct",
-        "datasets": ["webtext", "lamini"],
-        "params": 124e6,
-        "quantization": "int8",
-        "architecture": "decoder-only-transformer",
-        "license": "mit",
-    },
-    {
-        "name": "all-MiniLM-L6-v2-ct2-int8",
-        "tuning": "embedding",
-        "params": 22e6,
-        "quantization": "int8",
-        "architecture": "encoder-only-transformer",
-        "license": "apache-2.0",
-    },
-]
+models = (
+    ModelSpec(
+        name="flan-alpaca-xl-ct2-int8",
+        tuning="instruct",
+        params=3e9,
+        quantization="int8",
+        architecture="encoder-decoder-transformer",
+        license="cc-by-nc-4.0",  # HF says apache-2.0, but alpaca is NC
+        datasets=("c4", "flan", "alpaca"),
+    ),
+    ModelSpec(
+        name="flan-alpaca-gpt4-xl-ct2-int8",
+        tuning="instruct",
+        params=3e9,
+        quantization="int8",
+        architecture="encoder-decoder-transformer",
+        license="cc-by-nc-4.0",  # HF says apache-2.0, but alpaca is NC
+        datasets=("c4", "flan", "gpt4-alpaca"),
+    ),
+    ModelSpec(
+        name="flan-t5-xl-ct2-int8",
+        tuning="instruct",
+        params=3e9,
+        quantization="int8",
+        architecture="encoder-decoder-transformer",
+        license="apache-2.0",
+        datasets=("c4", "flan"),
+    ),
+    ModelSpec(
+        name="fastchat-t5-3b-v1.0-ct2-int8",
+        tuning="instruct",
+        params=3e9,
+        quantization="int8",
+        architecture="encoder-decoder-transformer",
+        license="apache-2.0",  # This does use OpenAI-generated data
+        datasets=("c4", "flan", "sharegpt"),
+    ),
+    ModelSpec(
+        name="LaMini-Flan-T5-783M-ct2-int8",
+        tuning="instruct",
+        params=783e6,
+        quantization="int8",
+        architecture="encoder-decoder-transformer",
+        license="cc-by-nc-4.0",
+        datasets=("c4", "flan", "lamini"),
+    ),
+    ModelSpec(
+        name="flan-t5-large-ct2-int8",
+        tuning="instruct",
+        params=783e6,
+        quantization="int8",
+        architecture="encoder-decoder-transformer",
+        license="apache-2.0",
+        datasets=("c4", "flan"),
+    ),
+    ModelSpec(
+        name="LaMini-Flan-T5-248M-ct2-int8",
+        tuning="instruct",
+        params=248e6,
+        quantization="int8",
+        architecture="encoder-decoder-transformer",
+        license="cc-by-nc-4.0",
+        datasets=("c4", "flan", "lamini"),
+    ),
+    ModelSpec(
+        name="flan-alpaca-base-ct2-int8",
+        tuning="instruct",
+        params=248e6,
+        quantization="int8",
+        architecture="encoder-decoder-transformer",
+        license="cc-by-nc-4.0",  # HF says apache-2.0, but alpaca is NC
+        datasets=("c4", "flan", "alpaca"),
+    ),
+    ModelSpec(
+        name="flan-t5-base-ct2-int8",
+        tuning="instruct",
+        params=248e6,
+        quantization="int8",
+        architecture="encoder-decoder-transformer",
+        license="apache-2.0",
+        datasets=("c4", "flan"),
+    ),
+    ModelSpec(
+        name="LaMini-Flan-T5-77M-ct2-int8",
+        tuning="instruct",
+        params=77e6,
+        quantization="int8",
+        architecture="encoder-decoder-transformer",
+        license="cc-by-nc-4.0",
+        datasets=("c4", "flan", "lamini"),
+    ),
+    ModelSpec(
+        name="flan-t5-small-ct2-int8",
+        tuning="instruct",
+        params=77e6,
+        quantization="int8",
+        architecture="encoder-decoder-transformer",
+        license="apache-2.0",
+        datasets=("c4", "flan"),
+    ),
+    ModelSpec(
+        name="LaMini-GPT-774M-ct2-int8",
+        tuning="instruct",
+        params=774e6,
+        quantization="int8",
+        architecture="decoder-only-transformer",
+        license="mit",
+        datasets=("webtext", "lamini"),
+    ),
+    ModelSpec(
+        name="LaMini-GPT-124M-ct2-int8",
+        tuning="instruct",
+        params=124e6,
+        quantization="int8",
+        architecture="decoder-only-transformer",
+        license="mit",
+        datasets=("webtext", "lamini"),
+    ),
+    ModelSpec(
+        name="all-MiniLM-L6-v2-ct2-int8",
+        tuning="embedding",
+        params=22e6,
+        quantization="int8",
+        architecture="encoder-only-transformer",
+        license="apache-2.0",
+    ),
+)
+
+
+# Bytes of weight storage per parameter for each supported quantization
+# This is used to estimate model memory size during model selection
+BYTES_PER_PARAM = {
+    "int8": 1.0,
+}
+
+# Models must use a supported quantization. This is checked once at import
+# rather than on every model lookup, and skipped entirely under `python -O`.
+if __debug__:
+    assert all(m.quantization in BYTES_PER_PARAM for m in models)
+
+# Index models by name and by tuning type, preserving priority order within
+# each tuning bucket
+MODELS_BY_NAME = {m.name: m for m in models}
+MODELS_BY_TUNING = {
+    tuning: [m for m in models if m.tuning == tuning]
+    for tuning in dict.fromkeys(m.tuning for m in models)
+}
+
+# Files and ctranslate2 classes used to load each model architecture
+# The final value indicates an encoder-only model used for embeddings, which
+# has tokenizer padding and truncation disabled
+ARCH_DISPATCH = {
+    "encoder-only-transformer": ("vocabulary.txt", ctranslate2.Encoder, True),
+    "decoder-only-transformer": ("vocabulary.json", ctranslate2.Generator, False),
+    "encoder-decoder-transformer": (
+        "shared_vocabulary.txt",
+        ctranslate2.Translator,
+        False,
+    ),
+}
+
+# Compiled license filter patterns
+LICENSE_CACHE = {}
 
 
 class ModelException(Exception):
@@ -151,6 +321,8 @@ def set_max_ram(value):
 
     This value takes priority over environment variables
 
+    When models run on a CUDA device, this limits GPU memory used by models
+
     Returns the numeric value set in GB
 
     >>> set_max_ram(16)
@@ -159,9 +331,10 @@ def set_max_ram(value):
     >>> set_max_ram('512mb')
     0.5
     """
-    global max_ram
+    global max_ram, _max_ram_cache
 
     max_ram = convert_to_gb(value)
+    _max_ram_cache = max_ram
 
     return max_ram
 
@@ -190,6 +363,17 @@ def get_max_ram():
     0.5
     """
 
+    global _max_ram_cache
+
+    if _max_ram_cache is None:
+        _max_ram_cache = _resolve_max_ram()
+
+    return _max_ram_cache
+
+
+def _resolve_max_ram():
+    """Computes max RAM from set_max_ram() or the environment"""
+
     if max_ram:
         return max_ram
 
@@ -225,6 +409,17 @@ def require_model_license(match_re):
     license_match = match_re
 
 
+# Memory size strings such as "512", "4G", or "256mb"
+# The number is parsed by float(), so anything float() accepts is allowed
+SIZE_RE = re.compile(r"(.*?)([gm]?)b*\Z", re.IGNORECASE | re.DOTALL)
+SIZE_MULTIPLIERS = {
+    "": 1.0,
+    "g": 1.0,
+    "m": 2**-10,
+}
+
+
+@lru_cache(maxsize=64)
 def convert_to_gb(space):
     """Convert max RAM string to int
 
@@ -246,23 +441,23 @@ def convert_to_gb(space):
 
     >>> convert_to_gb("256M")
     0.25
+
+    >>> convert_to_gb("2gb")
+    2.0
+
+    >>> convert_to_gb("1e3")
+    1000.0
     """
 
-    if isinstance(space, int) or isinstance(space, float):
+    if isinstance(space, (int, float)):
         return float(space)
 
-    multipliers = {
-        "g": 1.0,
-        "m": 2 ** -10,
-    }
+    number, unit = SIZE_RE.match(space).groups()
 
-    space = space.lower()
-    space = space.rstrip("b")
-
-    if space[-1] in multipliers:
-        return float(space[:-1]) * multipliers[space[-1]]
-    else:
-        return float(space)
+    try:
+        return float(number) * SIZE_MULTIPLIERS[unit.lower()]
+    except ValueError:
+        raise ValueError(f"Invalid memory size: {space}") from None
 
 
 def get_model_name(model_type, max_ram=0.40, license_match=None):
@@ -286,20 +481,174 @@ def get_model_name(model_type, max_ram=0.40, license_match=None):
     if os.environ.get("LANGUAGEMODELS_INSTRUCT_MODEL") and model_type == "instruct":
         return os.environ.get("LANGUAGEMODELS_INSTRUCT_MODEL")
 
-    for model in models:
-        assert model["quantization"] == "int8"
+    pattern = None
+    if license_match:
+        pattern = LICENSE_CACHE.get(license_match)
+        if not pattern:
+            pattern = LICENSE_CACHE[license_match] = re.compile(license_match)
 
-        memsize = model["params"] / 1e9
+    for model in MODELS_BY_TUNING.get(model_type, []):
+        memsize = model.params * BYTES_PER_PARAM[model.quantization] / 1e9
 
-        sizefit = memsize < max_ram
-        licensematch = not license_match or re.match(license_match, model["license"])
-
-        if model["tuning"] == model_type and sizefit and licensematch:
-            return model["name"]
+        if memsize < max_ram and (not pattern or pattern.match(model.license)):
+            return model.name
 
     raise ModelException(f"No valid model found for {model_type}")
 
 
+def download_model_files(model_name, filenames):
+    """Downloads files for a model from the Hugging Face Hub in parallel
+
+    Small files are fetched while the much larger model weights download.
+
+    Returns a list of local paths in the same order as `filenames`
+    """
+
+    with ThreadPoolExecutor(max_workers=len(filenames)) as executor:
+        return list(executor.map(lambda f: cached_download(model_name, f), filenames))
+
+
+def cached_download(model_name, filename):
+    """Returns the local path of a model file, downloading it if needed
+
+    Files already in the local Hugging Face cache are used without contacting
+    the Hub, which avoids an etag check for every file and allows loading
+    models while offline.
+    """
+
+    repo = f"jncraton/{model_name}"
+
+    try:
+        return hf_hub_download(repo, filename, local_files_only=True)
+    except LocalEntryNotFoundError:
+        return hf_hub_download(repo, filename)
+
+
+def prefetch_file(path):
+    """Asks the OS to begin reading a file into the page cache
+
+    This returns immediately and is a no-op on platforms without
+    posix_fadvise.
+    """
+
+    if not hasattr(os, "posix_fadvise"):
+        return
+
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+    finally:
+        os.close(fd)
+
+
+def get_model_architecture(model_name):
+    """Returns the architecture of a model
+
+    Models missing from the registry, such as those pinned via
+    LANGUAGEMODELS_INSTRUCT_MODEL, are identified by their name.
+
+    >>> get_model_architecture("LaMini-GPT-124M-ct2-int8")
+    'decoder-only-transformer'
+
+    >>> get_model_architecture("flan-t5-xxl-ct2-int8")
+    'encoder-decoder-transformer'
+    """
+
+    if model_name in MODELS_BY_NAME:
+        return MODELS_BY_NAME[model_name].architecture
+
+    if "minilm" in model_name.lower():
+        return "encoder-only-transformer"
+    elif "gpt" in model_name.lower():
+        return "decoder-only-transformer"
+    else:
+        return "encoder-decoder-transformer"
+
+
+def get_model_memsize(model_name):
+    """Returns the estimated memory size of a model's weights in GB
+
+    >>> get_model_memsize("LaMini-Flan-T5-248M-ct2-int8")
+    0.248
+
+    >>> get_model_memsize("unknown-model")
+    0.0
+    """
+
+    model = MODELS_BY_NAME.get(model_name)
+
+    if not model:
+        return 0.0
+
+    return model.params * BYTES_PER_PARAM[model.quantization] / 1e9
+
+
+def free_model_memory(model_name, max_ram):
+    """Unloads least recently used models until `model_name` fits in max_ram
+
+    `model_name` itself is never unloaded. Models that ctranslate2 is unable
+    to unload are skipped. All models share one device, so max_ram refers
+    to GPU memory when running on CUDA.
+
+    >>> class StubModel:
+    ...     def __init__(self, name):
+    ...         self.name = name
+    ...     def unload_model(self):
+    ...         print(f"Unloaded {self.name}")
+
+    >>> saved = dict(modelcache), list(loaded_models)
+    >>> modelcache.update({
+    ...     "flan-t5-small-ct2-int8": (None, StubModel("small")),
+    ...     "flan-t5-base-ct2-int8": (None, StubModel("base")),
+    ...     "flan-t5-large-ct2-int8": (None, StubModel("large")),
+    ...     "all-MiniLM-L6-v2-ct2-int8": (None, object()),
+    ... })
+
+    Nothing is unloaded while loaded models fit in max_ram:
+
+    >>> loaded_models[:] = ["flan-t5-base-ct2-int8", "all-MiniLM-L6-v2-ct2-int8"]
+    >>> free_model_memory("all-MiniLM-L6-v2-ct2-int8", 0.4)
+    >>> loaded_models
+    ['flan-t5-base-ct2-int8', 'all-MiniLM-L6-v2-ct2-int8']
+
+    Only the least recently used model is unloaded when over budget:
+
+    >>> loaded_models[:] = ["flan-t5-base-ct2-int8", "flan-t5-small-ct2-int8"]
+    >>> free_model_memory("flan-t5-large-ct2-int8", 1.0)
+    Unloaded base
+    >>> loaded_models
+    ['flan-t5-small-ct2-int8']
+
+    Encoders that can't be unloaded are skipped:
+
+    >>> loaded_models[:] = ["all-MiniLM-L6-v2-ct2-int8", "flan-t5-base-ct2-int8"]
+    >>> free_model_memory("flan-t5-large-ct2-int8", 1.0)
+    Unloaded base
+    >>> loaded_models
+    ['all-MiniLM-L6-v2-ct2-int8']
+
+    >>> modelcache.clear()
+    >>> modelcache.update(saved[0])
+    >>> loaded_models[:] = saved[1]
+    """
+
+    used = get_model_memsize(model_name)
+    used += sum(get_model_memsize(m) for m in loaded_models if m != model_name)
+
+    for victim in [m for m in loaded_models if m != model_name]:
+        if used <= max_ram:
+            break
+
+        try:
+            modelcache[victim][1].unload_model()
+        except AttributeError:
+            # Encoder-only models can't be unloaded by ctranslate2
+            continue
+
+        loaded_models.remove(victim)
+        used -= get_model_memsize(victim)
+
+
 def get_model(model_type, tokenizer_only=False):
     """Gets a model from the loaded model cache
 
@@ -320,58 +669,48 @@ def get_model(model_type, tokenizer_only=False):
     <class 'ctranslate2._ext.Encoder'>
     """
 
-    model_name = get_model_name(model_type, get_max_ram(), license_match)
+    mr = get_max_ram()
+
+    model_name = get_model_name(model_type, mr, license_match)
 
-    if get_max_ram() < 4 and not tokenizer_only:
-        for model in modelcache:
-            if model != model_name:
-                try:
-                    modelcache[model][1].unload_model()
-                except AttributeError:
-                    # Encoder-only models can't be unloaded by ctranslate2
-                    pass
+    if not tokenizer_only:
+        free_model_memory(model_name, mr)
 
     if model_name not in modelcache:
         model = None
 
-        hf_hub_download(f"jncraton/{model_name}", "config.json")
-        model_path = hf_hub_download(f"jncraton/{model_name}", "model.bin")
-        model_base_path = model_path[:-10]
+        architecture = get_model_architecture(model_name)
+        vocab_file, model_class, is_encoder = ARCH_DISPATCH[architecture]
+
+        _, model_path, _, tok_config = download_model_files(
+            model_name, ["config.json", "model.bin", vocab_file, "tokenizer.json"]
+        )
+        model_base_path = os.path.dirname(model_path)
 
-        if "minilm" in model_name.lower():
-            hf_hub_download(f"jncraton/{model_name}", "vocabulary.txt")
-            tokenizer = Tokenizer.from_pretrained(f"jncraton/{model_name}")
+        if not tokenizer_only:
+            # Start reading weights from disk while the tokenizer is parsed
+            prefetch_file(model_path)
+
+        tokenizer = Tokenizer.from_file(tok_config)
+
+        if is_encoder:
             tokenizer.no_padding()
             tokenizer.no_truncation()
 
-            if not tokenizer_only:
-                model = ctranslate2.Encoder(model_base_path, compute_type="int8")
-
-            modelcache[model_name] = (
-                tokenizer,
-                model,
-            )
-        elif "gpt" in model_name.lower():
-            hf_hub_download(f"jncraton/{model_name}", "vocabulary.json")
-            tokenizer = Tokenizer.from_pretrained(f"jncraton/{model_name}")
-            if not tokenizer_only:
-                model = ctranslate2.Generator(model_base_path, compute_type="int8")
-            modelcache[model_name] = (
-                tokenizer,
-                model,
+        if not tokenizer_only:
+            model = model_class(
+                model_base_path,
+                device=DEVICE,
+                compute_type=COMPUTE_TYPE,
+                inter_threads=INTER_THREADS,
+                intra_threads=INTRA_THREADS,
             )
-        else:
-            hf_hub_download(f"jncraton/{model_name}", "shared_vocabulary.txt")
-            tok_config = hf_hub_download(f"jncraton/{model_name}", "tokenizer.json")
-
-            tokenizer = Tokenizer.from_file(tok_config)
-            if not tokenizer_only:
-                model = ctranslate2.Translator(model_base_path, compute_type="int8")
-            modelcache[model_name] = (
-                tokenizer,
-                model,
-            )
-    elif not tokenizer_only:
+
+        modelcache[model_name] = (
+            tokenizer,
+            model,
+        )
+    elif not tokenizer_only and model_name not in loaded_models:
         # Make sure the model is reloaded if we've unloaded it
         try:
             modelcache[model_name][1].load_model()
@@ -379,4 +718,10 @@ def get_model(model_type, tokenizer_only=False):
             # Encoder-only models can't be unloaded in ctranslate2
             pass
 
+    if not tokenizer_only:
+        # Mark this model as most recently used
+        if model_name in loaded_models:
+            loaded_models.remove(model_name)
+        loaded_models.append(model_name)
+
     return modelcache[model_name]